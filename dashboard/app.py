@@ -3,6 +3,7 @@ import pandas as pd
 import numpy as np
 import os
 import time
+from functools import partial
 from urllib.parse import urlencode
 import plotly.graph_objects as go
 import pydeck as pdk
@@ -23,21 +24,17 @@ else:
     df = load_data(BASE_URL)
 data_load_state.text('Loading data...done!')
 
-# Data Preprocessing
-df["date"] = pd.to_datetime(df["date"])
-df["year"] = df["date"].dt.year
-df["month"] = df["date"].dt.month
-df["hour"] = df["date"].dt.hour
-df["weekday"] = df["date"].dt.day_name()
-order = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
-df["weekday"] = pd.Categorical(df["weekday"], categories=order, ordered=True)
+# Data Preprocessing (loaders already return "date" as datetime64[ns])
+dti = pd.DatetimeIndex(df["date"])
+df["year"] = dti.year.astype("int16")
+df["month"] = dti.month.astype("int8")
+df["hour"] = dti.hour.astype("int8")
+df["weekday"] = dti.dayofweek.astype("int8")  # 0 = Monday, labelled via WEEKDAYS when plotted
 
 
 ## Temporal Patterns
 # Data Preparation (Temporal Patterns)
-crimes_by_year = df.groupby("year", observed=False).size()
-crimes_by_hour = df.groupby("hour", observed=False).size()
-crimes_by_weekday = df.groupby("weekday", observed=False).size()
+crimes_by_year, crimes_by_hour, crimes_by_weekday = prepare_temporal_counts(df)
 
 # Charts (Temporal Patterns)
 chart_yearly_trend(crimes_by_year)
@@ -47,12 +44,15 @@ chart_weekly_trend(crimes_by_weekday)
 
 ## Spatial Patterns
 # Data Preparation (Spatial Patterns)
+# Drop missing coordinates here only: the temporal and district counts above
+# include incidents without a location, so df itself stays whole
 df_geo = df.dropna(subset=["latitude", "longitude"])
 df_sample = df_geo.sample(n=100000, random_state=42)
 
 # Charts (Spatial Patterns)
 st.markdown(f"**Crimes Spatial Distribution ({START_YEAR} - 2025)**")
-chart_heatmap(df_sample[["latitude", "longitude"]])
+# float32 coordinates would serialise as long decimals; round to ~1m instead
+chart_heatmap(df_sample[["latitude", "longitude"]].astype("float64").round(5))
 
 
 ## Top 10 High-Crime Districts
@@ -66,15 +66,18 @@ st.markdown("**Evolution of Crime Hotspots (2001 - 2024)**")
 # Data Preparation (Spatiotemporal)
 data_load_state = st.text('Loading large amount of data... This may take a while, please wait...')
 if LOAD_LOCAL_DATA:
-    df_hist = load_local_data_for_evolution_chart(LOCAL_DATA_2001_2024_FILEPATH)
+    # Local data is read per era from year-partitioned parquet
+    hist_dataset_path = prepare_local_evolution_dataset(LOCAL_DATA_2001_2024_FILEPATH)
+    load_era = partial(load_local_era, hist_dataset_path)
 else:
     df_hist = load_data_for_evolution_chart(BASE_URL)
+    load_era = partial(slice_era, df_hist)
 data_load_state.text('Loading data...done!')
 
 # Charts, side-by-side layout (Spatiotemporal)
 col1, col2 = st.columns(2)
 with col1:
-    chart_evolution(df_hist, id="first",default_option=0)
+    chart_evolution(load_era, id="first",default_option=0)
 
 with col2:
-    chart_evolution(df_hist, id="second",default_option=3)
+    chart_evolution(load_era, id="second",default_option=3)
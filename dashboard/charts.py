@@ -13,7 +13,7 @@ def chart_yearly_trend(crimes_by_year):
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=crimes_by_year.index,
+        x=crimes_by_year.index.values,
         y=crimes_by_year.values,
         mode="lines+markers",
         line=dict(width=3),
@@ -29,7 +29,8 @@ def chart_yearly_trend(crimes_by_year):
         yaxis=dict(
             tickformat=","  # thousands separator
         ),
-        hovermode="x unified"
+        hovermode="x unified",
+        uirevision="yearly"  # keep zoom/pan across reruns
     )
 
     st.plotly_chart(fig, width='stretch')
@@ -38,9 +39,10 @@ def chart_hourly_trend(crimes_by_hour):
     fig = go.Figure()
 
     fig.add_trace(go.Bar(
-        x=crimes_by_hour.index,
+        x=crimes_by_hour.index.values,
         y=crimes_by_hour.values,
-        name="Crimes"
+        name="Crimes",
+        hovertemplate="%{y:,}<extra></extra>"
     ))
 
     fig.update_layout(
@@ -59,17 +61,22 @@ def chart_weekly_trend(crimes_by_weekday):
     fig = go.Figure()
 
     fig.add_trace(go.Bar(
-        x=crimes_by_weekday.index,
+        x=crimes_by_weekday.index.values,
         y=crimes_by_weekday.values,
         width=0.75,
-        name="Crimes"
+        name="Crimes",
+        hovertemplate="%{y:,}<extra></extra>"
     ))
 
     fig.update_layout(
         title=f"Number of Crimes by Weekday ({START_YEAR} - 2025)",
         xaxis_title="Weekday",
         yaxis_title="Number of Crimes",
-        xaxis=dict(tickangle=45),
+        xaxis=dict(
+            tickangle=45,
+            tickvals=list(range(7)),
+            ticktext=WEEKDAYS
+        ),
         yaxis=dict(
             range=[y_min - pad, y_max + pad],
             tickformat=",",   # thousands separator
@@ -79,11 +86,12 @@ def chart_weekly_trend(crimes_by_weekday):
 
     st.plotly_chart(fig, width="stretch")
 
-def chart_heatmap(df):
+def chart_heatmap(df, get_weight=1):
     layer = pdk.Layer(
         "HeatmapLayer",
         data=df,
         get_position='[longitude, latitude]',
+        get_weight=get_weight,
         radiusPixels=60,
         intensity=1,
         threshold=0.05,
@@ -105,7 +113,30 @@ def chart_heatmap(df):
 
     st.pydeck_chart(deck)
 
-def chart_evolution(df_hist, id, default_option=0):
+# Keyed on the era only (the loader isn't hashed), so expire with the loaders
+@st.cache_data(ttl=MEMORY_CACHE_TTL_SEC)
+def _bin_era(_load_era, start_year, end_year):
+    sub = _load_era(start_year, end_year).dropna(subset=["latitude", "longitude"])
+
+    # Snap points to a fixed grid (~200m cells) so the heatmap gets one
+    # weighted point per cell instead of every incident in the era
+    lon_bin = np.floor((sub["longitude"] - HEATMAP_LON_ORIGIN) * HEATMAP_BINS_PER_DEGREE).astype("int32")
+    lat_bin = np.floor((sub["latitude"] - HEATMAP_LAT_ORIGIN) * HEATMAP_BINS_PER_DEGREE).astype("int32")
+
+    binned = (
+        pd.DataFrame({"lon_bin": lon_bin, "lat_bin": lat_bin})
+        .value_counts()
+        .reset_index(name="weight")
+    )
+
+    binned["longitude"] = (binned["lon_bin"] + 0.5) / HEATMAP_BINS_PER_DEGREE + HEATMAP_LON_ORIGIN
+    binned["latitude"] = (binned["lat_bin"] + 0.5) / HEATMAP_BINS_PER_DEGREE + HEATMAP_LAT_ORIGIN
+
+    # Only the plotted columns go to the browser; pydeck serialises them as
+    # Python floats, so rounding to ~1m is what keeps the JSON short
+    return binned[["longitude", "latitude", "weight"]].round({"longitude": 5, "latitude": 5})
+
+def chart_evolution(load_era, id, default_option=0):
     # Era selector 
     era_mapping = {
         "1. Early 2000s (2001–2006)": (2001, 2006),
@@ -117,12 +148,9 @@ def chart_evolution(df_hist, id, default_option=0):
 
     start_year, end_year = era_mapping[selected_era]
 
-    df_era = df_hist[
-        (df_hist['year'] >= start_year) &
-        (df_hist['year'] <= end_year)
-    ]
+    df_era = _bin_era(load_era, start_year, end_year)
 
-    chart_heatmap(df_era)
+    chart_heatmap(df_era, get_weight="weight")
 
 def chart_top_districts(district_counts):
     x_min = district_counts["Count"].min()
@@ -130,20 +158,22 @@ def chart_top_districts(district_counts):
     pad = (x_max - x_min) * 0.15
 
     district_counts = district_counts.sort_values("Count", ascending=True)
+    counts = district_counts["Count"].values
+    labels = district_counts["Label"].values
 
     fig = go.Figure()
 
     fig.add_trace(
         go.Bar(
-            x=district_counts["Count"],
-            y=district_counts["Label"],
+            x=counts,
+            y=labels,
             orientation="h",
 
-            text=[f"{x:,}" for x in district_counts["Count"]],
+            text=[f"{x:,}" for x in counts],
             textposition="outside",
 
             marker=dict(
-                color=district_counts["Count"],
+                color=counts,
                 colorscale="Reds",
                 showscale=False
             ),
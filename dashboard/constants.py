@@ -10,9 +10,25 @@ BASE_URL = "https://data.cityofchicago.org/resource/ijzp-q8t2.csv"
 START = "2016-01-01T00:00:00"
 END  = "2025-12-31T23:59:59"
 
-LIMIT = 50000
-SLEEP_SEC = 0.3
-MAX_PAGES = 1000
+# Fetch the whole date range in one request instead of paging
+LIMIT = 9999999999
+
+CACHE_DIR = "./cache"
+# Crime data updates daily, but the dashboard tolerates a week of staleness.
+# The feather files under CACHE_DIR are the only cache that survives restarts.
+CACHE_TTL_SEC = 7 * 24 * 3600
+# In-memory copies expire sooner, so a file refreshed in the background gets picked up
+MEMORY_CACHE_TTL_SEC = 3600
+
+# Concurrent per-year requests for the evolution chart (Socrata throttles beyond this)
+EVOLUTION_FETCH_WORKERS = 8
 
 # START_YEAR = 2014
-START_YEAR = 2016
\ No newline at end of file
+START_YEAR = 2016
+
+# Evolution heatmap grid: south-west corner of Chicago and cells per degree
+HEATMAP_LON_ORIGIN = -87.95
+HEATMAP_LAT_ORIGIN = 41.64
+HEATMAP_BINS_PER_DEGREE = 500
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
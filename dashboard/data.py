@@ -3,108 +3,280 @@ import pandas as pd
 import numpy as np
 import os
 import time
+import hashlib
+import shutil
+import threading
+from pathlib import Path
 from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from filelock import FileLock, Timeout
+from tenacity import retry, stop_after_attempt, wait_exponential
 import plotly.graph_objects as go
 import pydeck as pdk
 
 from constants import *
 
+# Explicit schema for the Socrata CSV export, so Arrow skips type inference
+CHICAGO_COLUMN_TYPES = {
+    "id": pa.int64(),
+    "case_number": pa.string(),
+    "date": pa.timestamp("ns"),
+    "block": pa.string(),
+    "iucr": pa.string(),
+    "primary_type": pa.string(),
+    "description": pa.string(),
+    "location_description": pa.string(),
+    "arrest": pa.bool_(),
+    "domestic": pa.bool_(),
+    "beat": pa.int32(),
+    "district": pa.int16(),
+    "ward": pa.int16(),
+    "community_area": pa.int16(),
+    "fbi_code": pa.string(),
+    "year": pa.int16(),
+    "latitude": pa.float32(),
+    "longitude": pa.float32(),
+    "location": pa.string(),
+}
+
+EVOLUTION_COLUMN_TYPES = {
+    col: CHICAGO_COLUMN_TYPES[col] for col in ["date", "year", "latitude", "longitude"]
+}
+EVOLUTION_SELECT_COLS = ",".join(EVOLUTION_COLUMN_TYPES)
+
+# Compact in-memory dtypes: nullable small ints, float32 coordinates and
+# categoricals for the repetitive string columns
+DOWNCAST_DTYPES = {
+    "beat": "Int32",
+    "district": "Int16",
+    "ward": "Int16",
+    "community_area": "Int16",
+    "year": "Int16",
+    "latitude": "float32",
+    "longitude": "float32",
+    "primary_type": "category",
+    "description": "category",
+    "location_description": "category",
+    "fbi_code": "category",
+    "block": "category",
+}
+
+# One keep-alive session for all Socrata requests, so concurrent year fetches
+# reuse pooled TLS connections. An app token lifts Socrata's per-IP throttling.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_session.headers["Accept-Encoding"] = "gzip"
+if os.environ.get("SOCRATA_APP_TOKEN"):
+    _session.headers["X-App-Token"] = os.environ["SOCRATA_APP_TOKEN"]
+
+def _downcast(df):
+    return df.astype({col: dtype for col, dtype in DOWNCAST_DTYPES.items() if col in df.columns})
+
+def _sort_by_year(df):
+    # slice_era cuts eras out of this order with searchsorted
+    return df.dropna(subset=["year"]).sort_values("year", kind="stable", ignore_index=True)
+
+def _cache_path(name, *key):
+    # hashlib rather than hash(): str hashes are salted per process
+    digest = hashlib.md5(repr(key).encode()).hexdigest()[:16]
+    return Path(CACHE_DIR) / f"{name}_{digest}.feather"
+
+def _is_fresh(path):
+    return path.exists() and time.time() - path.stat().st_mtime < CACHE_TTL_SEC
+
+def _refresh_cache(path, fetch, blocking=False):
+    # The lock stops concurrent sessions from downloading the same data twice
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with FileLock(f"{path}.lock", timeout=-1 if blocking else 0):
+            # Another session may have refreshed it while we waited for the lock
+            if _is_fresh(path):
+                return
+            tmp_path = path.with_name(path.name + ".tmp")
+            feather.write_feather(fetch(), tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+            print(f"Refreshed cached data at {path}")
+    except Timeout:
+        print(f"Refresh of {path} already in progress")
+
+def _load_cached(path, fetch):
+    # Stale-while-revalidate: serve any cached copy immediately and, once it is
+    # older than CACHE_TTL_SEC, swap in fresh data from a background thread
+    if path.exists():
+        if not _is_fresh(path):
+            threading.Thread(target=_refresh_cache, args=(path, fetch), daemon=True).start()
+    else:
+        _refresh_cache(path, fetch, blocking=True)
+
+    print(f"Reading cached data from {path}")
+    return feather.read_table(path)
+
+def _fetch_csv_table(url, column_types):
+    # Single streamed request, gzip on the wire, parsed by Arrow's multithreaded CSV reader
+    with _session.get(url, stream=True, timeout=600) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        return pa_csv.read_csv(
+            resp.raw,
+            read_options=pa_csv.ReadOptions(use_threads=True, block_size=8 << 20),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types)
+        )
+
+def _read_local_csv(file_path):
+    # Parse the CSV with Arrow once and keep a parquet copy beside it;
+    # later runs read the parquet copy unless the CSV has changed since
+    parquet_path = file_path + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+        return pd.read_parquet(parquet_path, engine="pyarrow")
+
+    table = pa_csv.read_csv(file_path, read_options=pa_csv.ReadOptions(use_threads=True))
+    pq.write_table(table, parquet_path, compression="zstd")
+    return table.to_pandas()
+
 @st.cache_data
 def load_local_data(file_path):
     # Ensure the path is correct
     if os.path.exists(file_path):
-        return pd.read_csv(file_path)
+        df = _read_local_csv(file_path)
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        # Unparseable dates would break the integer date parts derived in app.py
+        df = df.dropna(subset=['date']).reset_index(drop=True)
+        return _downcast(df)
     else:
         st.error(f"File not found: {file_path}")
         return None
 
 @st.cache_data
-def load_local_data_for_evolution_chart(file_path):
+def prepare_local_evolution_dataset(file_path):
     # Ensure the path is correct
-    if os.path.exists(file_path):
-        df = pd.read_csv(file_path)
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-            df['year'] = df['date'].dt.year
-        return df
-    else:
+    if not os.path.exists(file_path):
         st.error(f"File not found: {file_path}")
         return None
 
-@st.cache_data(persist=True)
-def load_data(BASE_URL):
+    # One-time conversion of the CSV into year=YYYY/ parquet partitions,
+    # so each era only reads the years it covers
+    dataset_path = os.path.splitext(file_path)[0]
+    if not os.path.exists(dataset_path) or os.path.getmtime(dataset_path) < os.path.getmtime(file_path):
+        df = pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(use_threads=True),
+            convert_options=pa_csv.ConvertOptions(include_columns=["date", "latitude", "longitude"])
+        ).to_pandas()
+        df['year'] = pd.to_datetime(df['date'], errors='coerce').dt.year
+        shutil.rmtree(dataset_path, ignore_errors=True)
+        df[["year", "latitude", "longitude"]].dropna(subset=["year"]).to_parquet(
+            dataset_path, partition_cols=["year"], engine="pyarrow", compression="zstd"
+        )
 
-    SELECT_COLS = ",".join([
-        "id", "case_number", "date",
-        "block", "iucr", "primary_type", "description", "location_description",
-        "arrest", "domestic",
-        "beat", "district", "ward", "community_area",
-        "fbi_code",
-        "year",
-        "latitude", "longitude",
-        "location"
-    ])
+    return dataset_path
 
-    chunks = []
-    offset = 0
+def load_local_era(dataset_path, start_year, end_year):
+    dataset = ds.dataset(dataset_path, format="parquet", partitioning="hive")
+    table = dataset.to_table(
+        filter=(ds.field("year") >= start_year) & (ds.field("year") <= end_year),
+        columns=["longitude", "latitude"]
+    )
+    return _downcast(table.to_pandas())
 
-    for page in range(MAX_PAGES):
-        params = {
-            "$select": SELECT_COLS,
-            "$where": f"date between '{START}' and '{END}'",
-            "$order": "date",
-            "$limit": LIMIT,
-            "$offset": offset
-        }
+def slice_era(df_hist, start_year, end_year):
+    # df_hist is sorted by year, so the era is one contiguous slice
+    first, last = df_hist['year'].searchsorted([start_year, end_year + 1])
+    return df_hist.iloc[first:last]
 
-        url = BASE_URL + "?" + urlencode(params)
+def _fetch_chicago(BASE_URL):
+    params = {
+        "$select": ",".join(CHICAGO_COLUMN_TYPES),
+        "$where": f"date between '{START}' and '{END}'",
+        "$order": "date",
+        "$limit": LIMIT
+    }
+
+    url = BASE_URL + "?" + urlencode(params)
 
-        df_part = pd.read_csv(url)
+    return _fetch_csv_table(url, CHICAGO_COLUMN_TYPES)
 
-        if df_part.empty:
-            print(f"Stop: page {page+1} is empty. Done.")
-            break
+@st.cache_data(ttl=MEMORY_CACHE_TTL_SEC)
+def load_data(BASE_URL):
 
-        chunks.append(df_part)
-        offset += LIMIT
+    SELECT_COLS = ",".join(CHICAGO_COLUMN_TYPES)
 
-        print(f"Page {page+1}: rows={len(df_part)}, next_offset={offset}")
-        time.sleep(SLEEP_SEC)
+    cache_path = _cache_path("chicago", START, END, SELECT_COLS)
+    table = _load_cached(cache_path, lambda: _fetch_chicago(BASE_URL))
 
-    df = pd.concat(chunks, ignore_index=True)
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = _downcast(table.to_pandas(types_mapper=pd.ArrowDtype))
+    df["date"] = df["date"].astype("datetime64[ns]")
 
     print("Final shape:", df.shape)
     return df
 
-@st.cache_data(persist=True)
-def load_data_for_evolution_chart(BASE_URL):
-    chunks = []
-       
-    SELECT_COLS = "date,year,latitude,longitude"
-    
-    for yr in range(2001, 2025):
-        print(f"  Fetching data for {yr}...", end="\r")
-        params = {
-            "$select": SELECT_COLS,
-            "$where": f"year={yr}",
-            "$limit": 15000,  # 15k rows per year = ~360k rows total (Perfect size)
-            "$order": "date"
-        }
-        url = BASE_URL + "?" + urlencode(params)
-        
-        try:
-            chunk = pd.read_csv(url)
-            chunks.append(chunk)
-        except Exception as e:
-            print(f"  Error fetching {yr}: {e}")
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(),
+    retry_error_callback=lambda state: print(f"  Error fetching {state.args[1]}: {state.outcome.exception()}")
+)
+def _fetch_year(BASE_URL, yr):
+    print(f"  Fetching data for {yr}...")
+    params = {
+        "$select": EVOLUTION_SELECT_COLS,
+        "$where": f"year={yr}",
+        "$limit": 15000,  # 15k rows per year = ~360k rows total (Perfect size)
+        "$order": "date"
+    }
+    url = BASE_URL + "?" + urlencode(params)
+    return _fetch_csv_table(url, EVOLUTION_COLUMN_TYPES)
 
+def _fetch_evolution(BASE_URL):
+    # Years are independent requests, so fetch them concurrently; map keeps year order
+    with ThreadPoolExecutor(max_workers=EVOLUTION_FETCH_WORKERS) as executor:
+        chunks = list(executor.map(lambda yr: _fetch_year(BASE_URL, yr), range(2001, 2025)))
+
+    # Years that still failed after retrying come back as None
+    chunks = [chunk for chunk in chunks if chunk is not None]
+
+    # Zero-copy: the yearly tables become chunks of one table
     print("\nmerging and saving...")
-    df = pd.concat(chunks, ignore_index=True)
+    return pa.concat_tables(chunks)
+
+@st.cache_data(ttl=MEMORY_CACHE_TTL_SEC)
+def load_data_for_evolution_chart(BASE_URL):
+    cache_path = _cache_path("chicago_hist", 2001, 2024, EVOLUTION_SELECT_COLS)
+    table = _load_cached(cache_path, lambda: _fetch_evolution(BASE_URL))
+
+    df = _sort_by_year(_downcast(table.to_pandas(types_mapper=pd.ArrowDtype)))
 
     return df
 
-@st.cache_data
+def _frame_fingerprint(df):
+    # Cheap cache key for the loaded dataset, instead of hashing every row
+    return len(df), df["date"].max()
+
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_fingerprint})
+def prepare_temporal_counts(df):
+    # Group with observed=True only: observed=False materialises the Cartesian
+    # product of every categorical key, so fixed axes are reindexed instead
+    crimes_by_year = df.groupby("year", observed=True).size()
+    # value_counts is a single hashing pass per column, cheaper than groupby().size()
+    crimes_by_hour = df["hour"].value_counts().reindex(range(24), fill_value=0)
+    crimes_by_weekday = df["weekday"].value_counts().reindex(range(7), fill_value=0)
+
+    return crimes_by_year, crimes_by_hour, crimes_by_weekday
+
+def _year_district_hist(year, district):
+    # (year, district) counts in a single bincount pass over a flattened key
+    first_year = year.min()
+    n_years = year.max() - first_year + 1
+    n_districts = district.max() + 1
+    hist = np.bincount((year - first_year) * n_districts + district, minlength=n_years * n_districts)
+    return hist.reshape(n_years, n_districts), first_year
+
+@st.cache_data(hash_funcs={pd.DataFrame: _frame_fingerprint})
 def prepare_top_districts(df, start_year=START_YEAR, end_year=2025, top_n=10):
   
     DISTRICT_MAP = {
@@ -132,21 +304,22 @@ def prepare_top_districts(df, start_year=START_YEAR, end_year=2025, top_n=10):
         25.0: '25: Grand Central (Northwest)'
     }
 
-    df_dist = df[
-        (df['date'].dt.year >= start_year) &
-        (df['date'].dt.year <= end_year)
-    ]
-
-    df_dist['district'] = pd.to_numeric(df_dist['district'], errors='coerce')
-
-    district_counts = (
-        df_dist['district']
-        .value_counts()
-        .nlargest(top_n)
-        .reset_index()
+    # Missing districts land in column 0, which is never a real district
+    hist, first_year = _year_district_hist(
+        df['year'].to_numpy(dtype="int64"),
+        df['district'].fillna(0).to_numpy(dtype="int64")
     )
+    hist_years = np.arange(first_year, first_year + hist.shape[0])
+    counts = hist[(hist_years >= start_year) & (hist_years <= end_year)].sum(axis=0)
+    counts[0] = 0
+
+    top_ids = np.argsort(-counts, kind="stable")[:top_n]
+    top_ids = top_ids[counts[top_ids] > 0]
 
-    district_counts.columns = ['District_ID', 'Count']
+    district_counts = pd.DataFrame({
+        'District_ID': top_ids,
+        'Count': counts[top_ids]
+    })
 
     district_counts['Label'] = (
         district_counts['District_ID']